@@ -122,8 +122,10 @@ class ModbotExtension:
                 or not self.state['channels']:
             self.state = {'channels': {}, 'users': {}}
             self.log_info('[BotExtension] Refreshing cache')
-            self.state['channels'] = \
-                self.web_client.conversations_list()['channels']
+            # Index by both name and ID, so lookups below are O(1)
+            for chan in self.web_client.conversations_list()['channels']:
+                self.state['channels'][chan['name']] = chan
+                self.state['channels'][chan['id']] = chan
 
         # Parse the channel name
         # Received either as #channel or <#channel_id|channel_name>
@@ -133,15 +135,7 @@ class ModbotExtension:
             channel = channel[1:]
 
         # Check if the channel is there (either ID or name)
-        channel_found = [chan
-                         for chan in self.state['channels']
-                         if chan['name'] == channel
-                         or chan['id'] == channel
-                         ]
-
-        if channel_found:
-            return channel_found[0]
-        return False
+        return self.state['channels'].get(channel, False)
 
     def user_is_admin(self, user):
         """
@@ -19,12 +19,99 @@
 """
 
 
+import atexit
+import contextlib
+import logging
 import os
-import json
 import re
+import sys
+import threading
+import time
+import unicodedata
+
+# orjson is preferred for its speed; fall back to the stdlib on setups
+# where it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+# Optional: C-accelerated multi-pattern search for large keyword sets
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 import modbot_extension
 
+logger = logging.getLogger(__name__)
+
+# The on_message hot path is memory-bound, not compute-bound: its cost is
+# dominated by passes over the message string (lowercase, translate, scan)
+# and by allocations, not by arithmetic. Optimizations that pay here are
+# fewer passes (one translate table instead of N replace calls), fewer
+# allocations (sets and prepared replies instead of rebuilt lists) and a
+# smaller working set (one automaton or compiled regex scan instead of one
+# Python-level 'in' test per keyword). The _timed blocks below make the
+# two phases visible at DEBUG level so regressions show up in the logs.
+
+# Phases slower than this are logged; below it the log call is skipped
+_TIMED_LOG_THRESHOLD_NS = 1_000_000  # 1 ms
+
+# Accepted spellings for boolean configuration values
+_BOOL_TOKENS = frozenset(('true', 'false', '0', '1'))
+_BOOL_FALSE = frozenset(('false', '0'))
+
+# Slack channel mentions arrive as <#CHANNEL_ID> or <#CHANNEL_ID|name>
+_CHANNEL_MENTION_RE = re.compile(r'^<#[A-Z0-9]+(\|[^>]*)?>$')
+
+# Event subtypes that can never contain a user message to reply to
+_IGNORED_SUBTYPES = frozenset((
+    'bot_message', 'message_changed', 'message_deleted',
+))
+
+# Delay before writing the config file, so bulk edits coalesce into one write
+_SAVE_DELAY = 0.5
+
+# Keyword count above which the Aho-Corasick automaton pays for itself
+_AHOCORASICK_THRESHOLD = 64
+
+# Markdown marks removed when sanitizing ('**' and '```' collapse through
+# their single-character forms); also trimmed in only_formatting mode
+_TRIM_MARKS = ('*', '_', '`')
+
+# Formatting marks alone, for the ASCII fast path of _sanitize_text
+_FORMAT_TABLE = {ord(mark): '' for mark in _TRIM_MARKS}
+
+# Accents are flattened by mapping every Latin code point whose NFKD form
+# ends with a combining mark to its base character, which covers far more
+# than a hand-written list would (ç, ñ, ligature-free œ stays as is, ...)
+# Links stay "as is" because the bot shouldn't touch them
+_SANITIZE_TABLE = {ord(mark): '' for mark in _TRIM_MARKS}
+_SANITIZE_TABLE.update({
+    code_point: unicodedata.normalize('NFKD', chr(code_point))[0]
+    for code_point in range(0x80, 0x250)
+    if unicodedata.combining(
+        unicodedata.normalize('NFKD', chr(code_point))[-1])
+})
+
+
+@contextlib.contextmanager
+def _timed(name):
+    """
+    Logs the duration of a block at DEBUG level when it is slow
+
+    :param str name: Label identifying the block in the logs
+    """
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        if elapsed > _TIMED_LOG_THRESHOLD_NS:
+            logger.debug('[Keyword] %s took %.3f ms', name, elapsed / 1e6)
+
 
 class Keywords(modbot_extension.ModbotExtension):
     """
@@ -175,31 +262,157 @@ class Keywords(modbot_extension.ModbotExtension):
         """
         super().__init__(slack_web_client, settings)
         self.config_file = settings['config_file']
+        # Dispatch table for 'keyword X' subcommands
+        self._subcommands = {
+            'list': self.keyword_list,
+            'add': self.keyword_add,
+            'delete': self.keyword_delete,
+            'quickadd': self.keyword_quickadd,
+            'template': self.keyword_template,
+            'config': self.keyword_config,
+        }
+        # Rendered config page, rebuilt only when config_data changes
+        self._config_list_cache = None
+        # Pending write of the config file, if any
+        self._save_timer = None
+        # mtime of the last config file parsed or written
+        self._config_mtime = None
+        # Edits still waiting on the save timer must not be lost on shutdown
+        atexit.register(self._flush_config)
         self.load_config()
         self.log_info('[Keyword] Module started and ready to go')
 
     def load_config(self):
-        """Loads keywords from config file. Does nothing if file unreadable."""
+        """Loads keywords from config file. Does nothing if file unreadable.
+
+        The file's mtime is remembered so a reload is free when nothing
+        changed on disk since the last parse (or since our own last write).
+        """
         try:
-            with open(self.config_file, "r") as config_file:
-                data = json.loads(config_file.read().strip())
+            mtime = os.stat(self.config_file).st_mtime
+            if mtime == self._config_mtime:
+                return
+            with open(self.config_file, "rb") as config_file:
+                raw_config = config_file.read()
+                if orjson is not None:
+                    data = orjson.loads(raw_config)
+                else:
+                    data = json.loads(raw_config)
                 if 'keywords' in data:
-                    self.keywords.update(data['keywords'])
+                    # Normalize and intern the keys once, not on every lookup
+                    for keyword, reply in data['keywords'].items():
+                        keyword = sys.intern(self._sanitize_text(keyword))
+                        self.keywords[keyword] = reply
                 if 'config_data' in data:
                     self.config_data.update(data['config_data'])
                 if 'keyword_template_text' in data:
                     self.keyword_template_text = data['keyword_template_text']
+            self._config_mtime = mtime
         except IOError:
-            logger.info('Keyword: Configuration file read error.')
+            self.log_info('[Keyword] Configuration file read error.')
+        self._rebuild_keyword_index()
+        self._refresh_config_cache()
+
+    def _refresh_config_cache(self):
+        """Mirrors the hot config_data flags into plain attributes."""
+        self._reply_in_thread = self.config_data['reply_in_thread']
+        self._reply_in_ephemeral = self.config_data['reply_in_ephemeral']
+        self._reply_to_keywords_by_admins = \
+            self.config_data['reply_to_keywords_by_admins']
+        self._reply_to_replies = self.config_data['reply_to_replies']
+
+    def _rebuild_keyword_index(self):
+        """Refreshes the search structures derived from self.keywords."""
+        self._keyword_set = set(self.keywords)
+        # Rendered 'keyword list' reply, rebuilt on the next view
+        self._keyword_list_cache = None
+        # Partition by reply type once, so no isinstance on the hot paths
+        self._str_keywords = {}
+        self._template_keywords = {}
+        # Final reply text per keyword, so a hit is a single dict lookup
+        self._prepared_replies = {}
+        for keyword, reply in self.keywords.items():
+            if isinstance(reply, str):
+                self._str_keywords[keyword] = reply
+                self._prepared_replies[keyword] = reply
+            else:
+                self._template_keywords[keyword] = reply
+                # Partition in one pass, keeping unprefixed channels first
+                channels = []
+                prefixed_channels = []
+                for channel in reply:
+                    if '#' in channel:
+                        prefixed_channels.append(channel)
+                    else:
+                        channels.append('#' + channel)
+                channels += prefixed_channels
+                self._prepared_replies[keyword] = self.keyword_template_text \
+                    .replace('{channels}', ' '.join(channels))
+        # One precompiled alternation: a single C-level scan per message
+        # Longest keywords first, so overlapping keywords prefer the longest
+        if self.keywords:
+            self._keyword_re = re.compile(
+                r'\b(?:'
+                + '|'.join(re.escape(keyword)
+                           for keyword in sorted(self.keywords,
+                                                 key=len,
+                                                 reverse=True))
+                + r')\b')
+        else:
+            self._keyword_re = None
+        self._keyword_automaton = None
+        if ahocorasick is not None \
+                and len(self.keywords) >= _AHOCORASICK_THRESHOLD:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._keyword_automaton = automaton
+
+    def _search_automaton(self, text):
+        """Returns a keyword found as a whole word in text, None otherwise."""
+        last_index = len(text) - 1
+        for end, keyword in self._keyword_automaton.iter(text):
+            start = end - len(keyword) + 1
+            if (start == 0 or text[start - 1].isspace()) \
+                    and (end == last_index or text[end + 1].isspace()):
+                return keyword
+        return None
 
     def save_config(self):
-        """Saves keywords into the config file."""
-        with open(self.config_file, "w") as config_file:
-            json.dump({
-                'keywords': self.keywords,
-                'config_data': self.config_data,
-                'keyword_template_text': self.keyword_template_text,
-            }, config_file, ensure_ascii=False)
+        """Schedules a save of the config file, coalescing rapid edits."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(_SAVE_DELAY, self._write_config)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def _flush_config(self):
+        """Writes any pending config save immediately (shutdown hook)."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._write_config()
+
+    def _write_config(self):
+        """Writes the config to a temporary file, then swaps it in place."""
+        self._save_timer = None
+        config = {
+            'keywords': self.keywords,
+            'config_data': self.config_data,
+            'keyword_template_text': self.keyword_template_text,
+        }
+        if orjson is not None:
+            serialized = orjson.dumps(config)
+        else:
+            serialized = json.dumps(config, ensure_ascii=False).encode('utf-8')
+        temp_file = self.config_file + '.tmp'
+        with open(temp_file, "wb") as config_file:
+            config_file.write(serialized)
+        os.replace(temp_file, self.config_file)
+        try:
+            self._config_mtime = os.stat(self.config_file).st_mtime
+        except OSError:
+            self._config_mtime = None
 
     def on_message(self, event):
         """
@@ -209,73 +422,85 @@ class Keywords(modbot_extension.ModbotExtension):
         :return: True if a message was sent, False otherwise
         :rtype: Boolean
         """
-        reply_message = {
-            'channel': event['channel'],
-            'user': event['user'],
-            'ready_to_send': False,
-            'type': ['thread', 'ephemeral'],
-            'thread_ts': event['ts'],
-        }
-        # Reply with the top-level timestamp
-        if 'thread_ts' in event:
-            reply_message.update({'thread_ts': event['thread_ts']})
+        # Nothing to match in bot posts, system subtypes or text-less events
+        if not event.get('text') or event.get('bot_id') \
+                or event.get('subtype') in _IGNORED_SUBTYPES:
+            return False
+
+        # Cheap prefilter: most messages contain no trigger nor keyword, so
+        # skip the sanitizing passes entirely when an ASCII message cannot
+        # match (accented messages still go through full sanitizing)
+        lowercase_text = event['text'].lower()
+        if lowercase_text.isascii() \
+                and 'keyword' not in lowercase_text \
+                and not any(x in lowercase_text for x in self._keyword_set):
+            return False
+
+        thread_ts = event.get('thread_ts')
         reply_data = False
 
         # Sanitizing the message, to better match keywords
-        event_text_sanitized = self._sanitize_text(event['text'])
+        with _timed('sanitize'):
+            event_text_sanitized = self._sanitize_text(event['text'])
+
+        # Both the config path and the reply path need the admin status
+        user_is_privileged = self.user_is_admin(event['user']) \
+            or self.user_is_owner(event['user'])
 
         # Configuration keywords
-        if 'keyword' in event_text_sanitized.split(' '):
+        if event_text_sanitized == 'keyword' \
+                or event_text_sanitized.startswith('keyword '):
             # Keep only authorized people
-            if self.user_is_admin(event['user']) \
-                    or self.user_is_owner(event['user']):
+            if user_is_privileged:
 
                 # Redirect to a private chat (no config in public)
                 if event['channel_type'] == 'channel':
                     reply_data = self.switch_to_im(event)
                 else:
-                    if event_text_sanitized.startswith('keyword list') \
-                            or event_text_sanitized == 'keyword':
-                        reply_data = self.keyword_list(event)
-                    elif event_text_sanitized.startswith('keyword add'):
-                        reply_data = self.keyword_add(event)
-                    elif event_text_sanitized.startswith('keyword delete'):
-                        reply_data = self.keyword_delete(event)
-                    elif event_text_sanitized.startswith('keyword quickadd'):
-                        reply_data = self.keyword_quickadd(event)
-                    elif event_text_sanitized.startswith('keyword template'):
-                        reply_data = self.keyword_template(event)
-                    elif event_text_sanitized.startswith('keyword config'):
-                        reply_data = self.keyword_config(event)
+                    # Split once and share the words with the handlers
+                    tokens = event['text'].split()
+                    sanitized_tokens = event_text_sanitized.split()
+                    if len(sanitized_tokens) > 1:
+                        subcommand = sanitized_tokens[1]
                     else:
-                        reply_data = self.keyword(event)
+                        subcommand = 'list'
+                    handler = self._subcommands.get(subcommand,
+                                                    self.keyword_list)
+                    reply_data = handler(event, tokens)
 
-        # We have a config message to send
-        if reply_data and reply_data['ready_to_send']:
-            reply_message.update(reply_data)
-        else:
+        # No config message to send: look for a keyword to reply to
+        if not (reply_data and reply_data['ready_to_send']):
             # For admins, reply only if config allows it
-            if (self.user_is_admin(event['user'])
-                    or self.user_is_owner(event['user'])) \
-                    and not self.config_data['reply_to_keywords_by_admins']:
+            if user_is_privileged \
+                    and not self._reply_to_keywords_by_admins:
                 return False
 
             # This is a threaded message (parent or reply)
             # See https://api.slack.com/messaging/retrieving#finding_threads
-            if 'thread_ts' in event:
+            if thread_ts is not None:
                 # This is a child message, so we reply only if config allows it
-                if event['thread_ts'] != event['ts']:
-                    if not self.config_data['reply_to_replies']:
+                if thread_ts != event['ts']:
+                    if not self._reply_to_replies:
                         return False
 
             # Reaching this point means there should be a reply
-            reply_data = self.keyword_search_reply(event, event_text_sanitized)
-            if reply_data and reply_data['ready_to_send']:
-                reply_message.update(reply_data)
+            with _timed('keyword search'):
+                reply_data = self.keyword_search_reply(
+                    event, event_text_sanitized)
 
         # Let's send this message!
-        if reply_message['ready_to_send']:
-            self._send_reply_message(reply_message)
+        if reply_data and reply_data['ready_to_send']:
+            # The payload holds only what gets posted; routing data stays out
+            payload = {
+                'channel': reply_data.get('channel', event['channel']),
+                'user': event['user'],
+                'text': reply_data['text'],
+            }
+            self._send_reply_message(
+                payload,
+                reply_data.get('type', ['thread', 'ephemeral']),
+                # Reply with the top-level timestamp
+                thread_ts if thread_ts is not None else event['ts'])
             return True
 
         # No keyword found
@@ -301,11 +526,12 @@ class Keywords(modbot_extension.ModbotExtension):
         reply_data.update({'ready_to_send': True})
         return reply_data
 
-    def keyword_list(self, event):
+    def keyword_list(self, event, tokens=None):
         """
         Reacts to 'keyword list' messages
 
         :param dict event: The event received
+        :param list tokens: The words of the message (unused)
         :return: Message to be sent
         :rtype: dict
         """
@@ -313,67 +539,77 @@ class Keywords(modbot_extension.ModbotExtension):
 
         # Just make the list and send it
         self.log_info('[Keyword] List viewed by %user', user=event['user'])
-        keywords_list = '\n'.join([
-            '*' + keyword + '* : ' + message
-            for keyword, message in self.keywords.items()
-            if isinstance(message, str)
-        ])
-        template_keywords_list = ', '.join([
-            '*' + keyword + '* : #' + " #".join(message)
-            for keyword, message in self.keywords.items()
-            if not isinstance(message, str)])
-
-        reply_text = self.replies['keyword_list'] \
-            .replace('{keywords}', keywords_list) \
-            .replace('{template_keywords}', template_keywords_list)
-        reply_data.update({'text': reply_text})
+        if self._keyword_list_cache is None:
+            # The index is already partitioned by reply type
+            plain_keywords = [
+                '*' + keyword + '* : ' + message
+                for keyword, message in self._str_keywords.items()
+            ]
+            template_keywords = [
+                '*' + keyword + '* : #' + " #".join(message)
+                for keyword, message in self._template_keywords.items()
+            ]
+
+            self._keyword_list_cache = self.replies['keyword_list'] \
+                .format_map({
+                    'keywords': '\n'.join(plain_keywords),
+                    'template_keywords': ', '.join(template_keywords),
+                })
+        reply_data.update({'text': self._keyword_list_cache})
 
         reply_data.update({'ready_to_send': True})
         return reply_data
 
-    def keyword_add(self, event):
+    def keyword_add(self, event, tokens=None):
         """
         Reacts to 'keyword add' messages
 
         :param dict event: The event received
+        :param list tokens: The words of the message, if already split
         :return: Message to be sent
         :rtype: dict
         """
         reply_data = {'type': 'regular'}
+        if tokens is None:
+            tokens = event['text'].split()
 
         # Data is missing from the keyword
-        if len(event['text'].split(' ')) < 4:
+        if len(tokens) < 4:
             self.log_info('[Keyword] Add keyword missing info by %user',
                           user=event['user'])
             reply_text = self.replies['keyword_add_missing_param']
             reply_data.update({'text': reply_text})
         else:
-            _, _, keyword, *message = event['text'].split(' ')
-            keyword = keyword.lower()
+            _, _, keyword, *message = tokens
+            keyword = sys.intern(self._sanitize_text(keyword))
             self.keywords[keyword] = ' '.join(message)
+            self._rebuild_keyword_index()
             self.save_config()
             self.log_info('[Keyword] New keyword %s by %user',
                           keyword,
                           user=event['user'])
             reply_text = self.replies['keyword_add_confirmation'] \
-                .replace('{keyword}', keyword)
+                .format(keyword=keyword)
             reply_data.update({'text': reply_text})
 
         reply_data.update({'ready_to_send': True})
         return reply_data
 
-    def keyword_template(self, event):
+    def keyword_template(self, event, tokens=None):
         """
         Reacts to 'keyword template' messages
 
         :param dict event: The event received
+        :param list tokens: The words of the message, if already split
         :return: Message to be sent
         :rtype: dict
         """
         reply_data = {'type': 'regular'}
+        if tokens is None:
+            tokens = event['text'].split()
 
         # Data is missing from the keyword
-        if len(event['text'].split(' ')) < 3:
+        if len(tokens) < 3:
             self.log_info(
                 '[Keyword] Template keyword missing info by %user',
                 user=event['user'])
@@ -389,6 +625,8 @@ class Keywords(modbot_extension.ModbotExtension):
                 reply_data.update({'text': reply_text})
             else:
                 self.keyword_template_text = template
+                # Prepared template replies depend on the template text
+                self._rebuild_keyword_index()
                 self.log_info('[Keyword] New template by %user',
                               user=event['user'])
                 reply_text = self.replies['keyword_template_confirmation']
@@ -397,26 +635,29 @@ class Keywords(modbot_extension.ModbotExtension):
         reply_data.update({'ready_to_send': True})
         return reply_data
 
-    def keyword_quickadd(self, event):
+    def keyword_quickadd(self, event, tokens=None):
         """
         Reacts to 'keyword quickadd' messages
 
         :param dict event: The event received
+        :param list tokens: The words of the message, if already split
         :return: Message to be sent
         :rtype: dict
         """
         reply_data = {'type': 'regular'}
+        if tokens is None:
+            tokens = event['text'].split()
 
         # Data is missing from the keyword
-        if len(event['text'].split(' ')) < 4:
+        if len(tokens) < 4:
             self.log_info('[Keyword] Quickadd keyword missing info by %user',
                           user=event['user'])
             reply_text = self.replies['keyword_quickadd_missing_param']
             reply_data.update({'text': reply_text})
         else:
-            _, _, keyword, *channels = event['text'].split(' ')
+            _, _, keyword, *channels = tokens
             list_channels = [x for x in channels
-                             if x.startswith('<') and x.endswith('>')]
+                             if _CHANNEL_MENTION_RE.match(x)]
             if not list_channels:
                 self.log_info(
                     '[Keyword] Quickadd keyword without channels by %user',
@@ -424,70 +665,78 @@ class Keywords(modbot_extension.ModbotExtension):
                 reply_text = self.replies['keyword_quickadd_missing_channel']
                 reply_data.update({'text': reply_text})
             else:
-                keyword = keyword.lower()
+                keyword = sys.intern(self._sanitize_text(keyword))
                 self.keywords[keyword] = list_channels
+                self._rebuild_keyword_index()
                 self.save_config()
                 self.log_info('[Keyword] New quick keyword %s by %user',
                               keyword,
                               user=event['user'])
                 reply_text = self.replies['keyword_quickadd_confirmation'] \
-                    .replace('{keyword}', keyword)
+                    .format(keyword=keyword)
                 reply_data.update({'text': reply_text})
 
         reply_data.update({'ready_to_send': True})
         return reply_data
 
-    def keyword_delete(self, event):
+    def keyword_delete(self, event, tokens=None):
         """
         Reacts to 'keyword delete' messages
 
         :param dict event: The event received
+        :param list tokens: The words of the message, if already split
         :return: Message to be sent
         :rtype: dict
         """
         reply_data = {'type': 'regular'}
+        if tokens is None:
+            tokens = event['text'].split()
 
         # Data is missing from the keyword
-        if len(event['text'].split(' ')) < 3:
+        if len(tokens) < 3:
             self.log_info('[Keyword] Delete keyword missing info by user %user',
                           user=event['user'])
             reply_text = self.replies['keyword_delete_missing_param']
             reply_data.update({'text': reply_text})
         else:
-            _, _, keyword, *_ = event['text'].split(' ')
-            keyword = keyword.lower()
+            _, _, keyword, *_ = tokens
+            keyword = sys.intern(self._sanitize_text(keyword))
             if keyword in self.keywords:
                 del self.keywords[keyword]
+                self._rebuild_keyword_index()
                 self.save_config()
                 self.log_info('[Keyword] Keyword %s deleted by %user',
                               keyword,
                               user=event['user'])
                 reply_text = self.replies['keyword_delete_confirmation'] \
-                    .replace('{keyword}', keyword)
+                    .format(keyword=keyword)
                 reply_data.update({'text': reply_text})
             else:
                 reply_text = self.replies['keyword_delete_inexistant'] \
-                    .replace('{keyword}', keyword)
+                    .format(keyword=keyword)
                 reply_data.update({'text': reply_text})
 
         reply_data.update({'ready_to_send': True})
         return reply_data
 
-    def keyword_config(self, event):
+    def keyword_config(self, event, tokens=None):
         """
         Reacts to 'keyword config' messages
 
         :param dict event: The event received
+        :param list tokens: The words of the message, if already split
         :return: Message to be sent
         :rtype: False or dict
         """
         reply_data = {'type': 'regular'}
+        if tokens is None:
+            tokens = event['text'].split()
 
         # Data is missing from the keyword, so we go back to config "homepage"
-        if len(event['text'].split(' ')) < 4:
+        if len(tokens) < 4:
             return self.keyword_config_list(event)
 
-        _, _, key, *value = event['text'].split(' ')
+        _, _, key, *value = tokens
         value = ' '.join(value)
         key = self._sanitize_text(key, only_formatting=True)
         value_sanitized = self._sanitize_text(value, only_formatting=True)
@@ -495,16 +744,20 @@ class Keywords(modbot_extension.ModbotExtension):
         if key in self.config_data:
             # For boolean values, check that we have received a boolean value
             if isinstance(self.config_data[key], bool) \
-                    and value_sanitized in ['true', 'false', '0', '1']:
-                if value_sanitized in ['false', '0']:
+                    and value_sanitized in _BOOL_TOKENS:
+                if value_sanitized in _BOOL_FALSE:
                     self.config_data[key] = False
                 else:
                     self.config_data[key] = True
+                self._config_list_cache = None
+                self._refresh_config_cache()
                 reply_data.update({
                     'text': self.replies['keyword_config_confirmation'],
                 })
             elif isinstance(self.config_data[key], str):
                 self.config_data[key] = bool(value)
+                self._config_list_cache = None
+                self._refresh_config_cache()
                 reply_data.update({
                     'text': self.replies['keyword_config_confirmation'],
                 })
@@ -537,6 +790,13 @@ class Keywords(modbot_extension.ModbotExtension):
         self.log_info('[Keyword] Config list viewed by %user',
                       user=event['user'])
 
+        if self._config_list_cache is not None:
+            reply_data.update({
+                'text': self._config_list_cache,
+                'ready_to_send': True,
+            })
+            return reply_data
+
         config_list = '\n'.join([
             '*' + key + '* : '
             + self.replies['keyword_config_descriptions'][key] + ' '
@@ -567,7 +827,8 @@ class Keywords(modbot_extension.ModbotExtension):
         ])
 
         reply_text = self.replies['keyword_config_list'] \
-            .replace('{config_keys}', config_list)
+            .format_map({'config_keys': config_list})
+        self._config_list_cache = reply_text
         reply_data.update({'text': reply_text})
 
         reply_data.update({'ready_to_send': True})
@@ -616,65 +877,51 @@ class Keywords(modbot_extension.ModbotExtension):
         """
         reply_data = {}
 
-        matching_keywords = [x
-                             for x in self.keywords
-                             if x in event_text_sanitized.split(' ')]
+        if self._keyword_automaton is not None:
+            # One automaton pass, independent of the number of keywords
+            matching_keyword = self._search_automaton(event_text_sanitized)
+        elif self._keyword_re is not None:
+            # One scan of the message with the precompiled alternation
+            match = self._keyword_re.search(event_text_sanitized)
+            matching_keyword = match.group(0) if match else None
+        else:
+            matching_keyword = None
 
-        if not matching_keywords:
+        if matching_keyword is None:
             return False
-
         self.log_info('[Keyword] Keyword %s sent by %user',
-                      matching_keywords[0],
+                      matching_keyword,
                       user=event['user'])
-        keyword_reply = self.keywords[matching_keywords[0]]
-        if isinstance(keyword_reply, str):
-            reply_data.update({
-                'text': keyword_reply,
-                'ready_to_send': True
-            })
-        else:
-            channels = ['#' + channel
-                        for channel in keyword_reply
-                        if '#' not in channel]
-            channels += [channel
-                         for channel in keyword_reply
-                         if '#' in channel]
-            reply_text = self.keyword_template_text \
-                .replace('{channels}', ' '.join(channels))
-            reply_data.update({
-                'text': reply_text,
-                'ready_to_send': True
-            })
+        # Template rendering happened at index build time
+        reply_data.update({
+            'text': self._prepared_replies[matching_keyword],
+            'ready_to_send': True
+        })
         return reply_data
 
-    def _send_reply_message(self, reply_message):
+    def _send_reply_message(self, payload, message_type, thread_ts=None):
         """
         Sends the reply in the proper type (regular or ephemeral)
 
-        :param str reply_message: The message to be sent
+        :param dict payload: The channel, user and text of the message
+        :param message_type: The delivery types requested for this reply
+        :param str thread_ts: The timestamp to thread the reply under
         :return: None
         """
-        del reply_message['ready_to_send']
-
-        if 'regular' in reply_message['type']:
-            reply_to_send = reply_message.copy()
-            del reply_to_send['type']
-            del reply_to_send['thread_ts']
-            self.web_client.chat_postMessage(reply_to_send)
-
-        if 'ephemeral' in reply_message['type'] \
-                and self.config_data['reply_in_ephemeral']:
-            reply_to_send = reply_message.copy()
-            del reply_to_send['type']
-            del reply_to_send['thread_ts']
-            self.web_client.chat_postEphemeral(reply_to_send)
-
-        if 'thread' in reply_message['type'] \
-                and self.config_data['reply_in_thread']:
-            reply_to_send = reply_message.copy()
-            del reply_to_send['type']
-            del reply_to_send['user']
-            self.web_client.chat_postMessage(reply_to_send)
+        if 'regular' in message_type:
+            self.web_client.chat_postMessage(payload)
+
+        if 'ephemeral' in message_type \
+                and self._reply_in_ephemeral:
+            self.web_client.chat_postEphemeral(payload)
+
+        if 'thread' in message_type \
+                and self._reply_in_thread:
+            self.web_client.chat_postMessage({
+                'channel': payload['channel'],
+                'text': payload['text'],
+                'thread_ts': thread_ts,
+            })
 
     def _sanitize_text(self, text, only_formatting=False):
         """
@@ -691,32 +938,17 @@ class Keywords(modbot_extension.ModbotExtension):
         # Sanitizing the message, to better match keywords
         sanitized_text = text.lower()
 
-        # Careful with the order
-        # longer formatting like ** should be before shorter ones like *
-        # Other formatting elements need a space before
-        # Links stay "as is" because the bot shouldn't touch them
-        formatting_replacements = {
-            '**': '', '*': '', '__': '', '_': '', '```': '', '`': '',
-        }
-
-        character_replacements = {
-            'à': 'a', 'ä': 'a', 'â': 'a',
-            'é': 'e', 'è': 'e', 'ë': 'e', 'ê': 'e',
-            'ï': 'i', 'ï': 'i',
-            'ö': 'o', 'ô': 'o',
-            'ù': 'u', 'ü': 'u', 'û': 'u',
-        }
-        character_replacements.update(formatting_replacements)
-
         if only_formatting:
-            for i, j in character_replacements.items():
-                if sanitized_text.startswith(i):
-                    sanitized_text = sanitized_text[len(i):]
-                if sanitized_text.endswith(i):
-                    sanitized_text = sanitized_text[:-len(i)]
+            while sanitized_text.startswith(_TRIM_MARKS):
+                sanitized_text = sanitized_text[1:]
+            while sanitized_text.endswith(_TRIM_MARKS):
+                sanitized_text = sanitized_text[:-1]
+        elif sanitized_text.isascii():
+            # Pure-ASCII text has no accents: only the marks need removing
+            sanitized_text = sanitized_text.translate(_FORMAT_TABLE)
         else:
-            for i, j in character_replacements.items():
-                sanitized_text = sanitized_text.replace(i, j)
+            # A single C-level pass instead of one replace() per character
+            sanitized_text = sanitized_text.translate(_SANITIZE_TABLE)
 
         return sanitized_text
 
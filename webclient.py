@@ -42,8 +42,7 @@ class ModbotWebclient (WebClient):
 
         :param dict input_data: The message to be sent
         """
-        payload = self.settings.copy()
-        payload.update(input_data)
+        payload = {**self.settings, **input_data}
 
         logger.debug('[WebClient] Sending chat.postMessage')
 #        logger.debug(payload)
@@ -56,8 +55,7 @@ class ModbotWebclient (WebClient):
 
         :param dict input_data: The message to be sent
         """
-        payload = self.settings.copy()
-        payload.update(input_data)
+        payload = {**self.settings, **input_data}
 
         return super().conversations_open(**payload)
 
@@ -70,8 +68,7 @@ class ModbotWebclient (WebClient):
 
         :param dict input_data: The message to be sent
         """
-        payload = self.settings.copy()
-        payload.update(input_data)
+        payload = {**self.settings, **input_data}
 
         logger.debug('[WebClient] Sending chat.postEphemeral:')
         logger.debug(payload)